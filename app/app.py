@@ -1,27 +1,57 @@
+import json
 import logging
 
 import threading
 import os
 import sys
 
-from flask import Flask, request, jsonify, Response,send_from_directory
+from flask import Flask, request, jsonify, Response,send_from_directory, send_file, abort
 from flask_cors import CORS
+from werkzeug.utils import safe_join
 
-import jsonschema
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
 # -- local imports
 from app.config import config
-from app.utils import get_ip, get_process_metrics
+from app.utils import get_ip, get_process_metrics, LRUDict
 from app.sse.routes import setup_sse_listen, notify_subscribers, stream
-from app.schema import likert_schema, user_schema, answer_schema
+from app.schema import (likert_validator, user_validator, answer_validator,
+                        is_valid_likert_value, is_valid_uuid)
 
 
 # ---------------------------------------------------------------------------------------------------- Global vars
 version = "0.1.0"
-nicknames = {}
-likertScores = {}
+# resolved once at import: get_ip() opens a UDP socket per call, the address
+# does not change while the server is running
+CACHED_IP = get_ip()
+LRU_MAXSIZE = 10000  # bound on the per-server state dicts; oldest entries are evicted
+
+
+def _on_nickname_evict(uuid, name):
+    """Drop an evicted nickname from the derived caches."""
+    global _nicknames_cache, _nicknames_json_cache
+    if name not in nicknames.values():
+        nickname_set.discard(name)
+    _nicknames_cache = None
+    _nicknames_json_cache = None
+
+
+nicknames = LRUDict(maxsize=LRU_MAXSIZE, on_evict=_on_nickname_evict)
+nickname_set = set()  # parallel set of nicknames for O(1) membership checks
+_nicknames_cache = None  # cached list(nicknames.values()), invalidated on change
+_nicknames_json_cache = None  # serialized body for GET /nicknames, invalidated with it
+_likert_json_by_id = {}  # likert id -> serialized body for GET /likert/<id>, invalidated on write
+likertScores = LRUDict(maxsize=LRU_MAXSIZE, default_factory=dict,
+                       on_evict=lambda likert_id, _: _likert_json_by_id.pop(likert_id, None))  # likert id -> {user: value}
+_likerts_json_cache = None  # serialized body for GET /likerts, invalidated on write
+
+
+def _nicknames_list():
+    """Return the cached list of nicknames, rebuilding it after a change."""
+    global _nicknames_cache
+    if _nicknames_cache is None:
+        _nicknames_cache = list(nicknames.values())
+    return _nicknames_cache
 #static_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '../static'))
 static_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../docs'))
 
@@ -44,7 +74,9 @@ app = Flask(__name__)
 
 # ---------------------------------------------------------------------------------------------------- SSE setup
 
-sse_manager = setup_sse_listen(app, config.sse_port) # Setup SSE listening route
+sse_manager = setup_sse_listen(app) # Setup the in-process SSE bus
+# the SSE bus runs inside this process, so monitoring targets our own pid
+app.config['global_pid'] = os.getpid()
 
 
 # ---------------------------------------------------------------------------------------------------- Event routes
@@ -79,16 +111,31 @@ def ping():
 def post_icon_name():
     """Receive a JSON object with a name field, which is equivalent to a anonymous login."""
     data = request.get_json()  # Extract JSON data from request
+    # cheap pre-check of the pattern field before the full schema walk
+    if isinstance(data, dict) and not is_valid_uuid(data.get('uuid')):
+        logger.error("Validation error: invalid uuid: %s", data.get('uuid'))
+        return jsonify({'status': 'error', 'message': 'Validation error'}), 400
     try:
-        validate(data, user_schema)
+        user_validator.validate(data)
     except ValidationError as e:
-        logger.error(f"Validation error: {e.message}")
-        logger.error(f"Checked against schema: {likert_schema}")
+        logger.error("Validation error: %s", e.message)
+        logger.debug("Checked against schema: %s", user_validator.schema)
         return jsonify({'status': 'error', 'message': 'Validation error'}), 400
+    global _nicknames_cache, _nicknames_json_cache
     uuid = data['uuid']
+    old_name = nicknames.get(uuid)
+    if old_name == data['user']:
+        # same user re-posts their own name: nothing changed, skip the broadcast
+        return jsonify({'status': 'success', 'message': 'Data received'}), 200
     nicknames[uuid] = data['user']  # Store the name in the global dictionary
-    logger.info(f"nicknames: {nicknames}")
-    notify_subscribers(sse_manager,{"nicknames":list(nicknames.values()) }, "NICKNAME")  # Notify subscribers with the new name
+    _nicknames_cache = None
+    _nicknames_json_cache = None
+    # keep the nickname set in sync; only drop the old name if no other uuid still uses it
+    if old_name is not None and old_name != data['user'] and old_name not in nicknames.values():
+        nickname_set.discard(old_name)
+    nickname_set.add(data['user'])
+    logger.debug("nicknames: %s", nicknames)
+    notify_subscribers(sse_manager,{"nicknames": _nicknames_list()}, "NICKNAME")  # Notify subscribers with the new name
     return jsonify({'status': 'success', 'message': 'Data received'}), 200
 
 # test with
@@ -107,7 +154,10 @@ def get_icon_name(uuid):
 @app.route('/nicknames', methods=['GET'])
 def get_icon_names():
     """Return the list of nicknames."""
-    return jsonify({'nicknames': list(nicknames.values())}), 200
+    global _nicknames_json_cache
+    if _nicknames_json_cache is None:
+        _nicknames_json_cache = json.dumps({'nicknames': _nicknames_list()})
+    return Response(_nicknames_json_cache, mimetype='application/json'), 200
 
 # ----------------------------------------------------------------------------------------------------- Likert scale routes
 # test with
@@ -116,33 +166,45 @@ def get_icon_names():
 def post_likert():
     """Receive a JSON object with a likert field."""
     data = request.get_json()
-    logger.info(f"Received data: {data}")
+    logger.debug("Received data: %s", data)
+    # cheap pre-check of the pattern field before the full schema walk
+    if isinstance(data, dict) and not is_valid_likert_value(data.get('value')):
+        logger.error("Validation error: invalid likert value: %s", data.get('value'))
+        return jsonify({'status': 'error', 'message': 'Validation error'}), 400
     # check against json schema
     try:
-        validate(data, likert_schema)
+        likert_validator.validate(data)
     except ValidationError as e:
-        logger.error(f"Validation error: {e.message}")
-        logger.error(f"Checked against schema: {likert_schema}")
+        logger.error("Validation error: %s", e.message)
+        logger.debug("Checked against schema: %s", likert_validator.schema)
         return jsonify({'status': 'error', 'message': 'Validation error'}), 400
     # copy field likert and value to a new dictionary
     # update = {'likert': data['likert'], 'value': data['value']}
     user = data['user']
     # check if the user is known
-    logger.info(f"nicknames: {nicknames}")
-    if user not in nicknames.values():
+    logger.debug("nicknames: %s", nicknames)
+    if user not in nickname_set:
         return jsonify({'status': 'error', 'message': 'Unknown user can not vote'}), 400
     # create or update a nested dictionary with user and likert as keys
-    likertScores.setdefault(data['likert'], {})[user] = data['value']
-    notify_subscribers(sse_manager, {"percentage": calcLikertPercentage(likertScores[data['likert']])} , f'A-{data["likert"]}')  # Notify subscribers with the new name
-    return jsonify({'status': 'success', 'message': f'Data received for key {data["likert"]}'}), 200
+    global _likerts_json_cache
+    likert_id = data['likert']
+    user_scores = likertScores[likert_id]
+    user_scores[user] = data['value']
+    _likerts_json_cache = None
+    _likert_json_by_id.pop(likert_id, None)
+    notify_subscribers(sse_manager, {"percentage": calcLikertPercentage(user_scores)} , f'A-{likert_id}')  # Notify subscribers with the new name
+    return jsonify({'status': 'success', 'message': f'Data received for key {likert_id}'}), 200
 
 # test with
 @app.route('/likerts', methods=['GET'])
 # curl -X GET http://localhost:5050/likerts
 def get_likert():
     """Return the list of likert scores."""
-    logger.warning("likertScores: {likertScores}")
-    return jsonify({'likert': likertScores}), 200
+    global _likerts_json_cache
+    logger.debug("likertScores: %s", likertScores)
+    if _likerts_json_cache is None:
+        _likerts_json_cache = json.dumps({'likert': likertScores})
+    return Response(_likerts_json_cache, mimetype='application/json'), 200
 
 # get the likert score for all users and ONE likert id in percentage with 0:100%, 1:75%, 2:50%, 3:25%, 4:0%
 @app.route('/likert/<likert_id>', methods=['GET'])
@@ -153,21 +215,39 @@ def get_likert_scale(likert_id):
     if likert_id not in likertScores:
         return jsonify({'warning': f'No likert scores found for the given likert id: {likert_id}'}), 200
     else:
-        return jsonify({'likert': calcLikertPercentage(likertScores[likert_id])}), 200
-        # percentage = 100 - (scores[likert_id] * 25)
-        # return jsonify({'likert': percentage}), 200
+        body = _likert_json_by_id.get(likert_id)
+        if body is None:
+            body = json.dumps({'likert': calcLikertPercentage(likertScores[likert_id])})
+            _likert_json_by_id[likert_id] = body
+        return Response(body, mimetype='application/json'), 200
+
+
+# contribution of each likert value, indexed by int(value): 0:100%, 1:75%, 2:50%, 3:25%, 4:0%
+_CONTRIB = (1.0, 0.75, 0.5, 0.25, 0.0)
 
+# memoization cache for calcLikertPercentage, keyed on the immutable score set.
+# A write changes the key, so stale entries are never served; the cache is
+# cleared when it grows too large.
+_pct_cache = {}
 
 def calcLikertPercentage(likertScores):
-    contribution = {"0":1, "1":0.75, "2":0.5, "3":0.25, "4":0}
-    # calculate the percentage of the likert score
-    scores = likertScores
-    contribs = [contribution[score] for score in list(scores.values())]
-    # average the contributions
-    percentage = sum(contribs) / len(contribs) * 100
-    return round(percentage)
+    # a frozenset of the (user, value) pairs identifies the score set uniquely
+    key = frozenset(likertScores.items())
+    hit = _pct_cache.get(key)
+    if hit is not None:
+        return hit
+    # average the contributions of all scores
+    percentage = round(sum(_CONTRIB[int(score)] for score in likertScores.values())
+                       / len(likertScores) * 100)
+    if len(_pct_cache) > 1024:
+        _pct_cache.clear()
+    _pct_cache[key] = percentage
+    return percentage
 # ------------------------------------------------------------------------------------------------------ Answer routes
-answers = {}
+_answer_json_by_qid = {}  # question id -> serialized body for GET /answer/<qid>, invalidated on write
+answers = LRUDict(maxsize=LRU_MAXSIZE, default_factory=dict,
+                  on_evict=lambda qid, _: _answer_json_by_qid.pop(qid, None))  # question id -> {user: answer}
+_answers_json_cache = None  # serialized body for GET /answers, invalidated on write
 # post an answer identified by user and question id
 # curl -X POST -H "Content-Type: application/json" -d '{"answer":"I mean yes", "qid":"inputField1", "user":"Hund"}' http://localhost:5050/answer
 @app.route('/answer', methods=['POST'])
@@ -175,24 +255,27 @@ def post_answer():
     """Receive a JSON object with a answer field."""
     data = request.get_json()
     try:
-        validate(data, answer_schema)
+        answer_validator.validate(data)
     except ValidationError as e:
-        logger.error(f"Validation error: {e.message}")
-        logger.error(f"Checked against schema: {likert_schema}")
+        logger.error("Validation error: %s", e.message)
+        logger.debug("Checked against schema: %s", answer_validator.schema)
         return jsonify({'status': 'error', 'message': 'Validation error'}), 400
     # check if the uuid is known
     user = data['user']
     qid = data['qid']
-    if user not in nicknames.values():
-        logger.error(f"Unknown user: {user}")
+    if user not in nickname_set:
+        logger.error("Unknown user: %s", user)
         return jsonify({'status': 'error', 'message': 'Unknown uuid'}), 400
     # store the answer in a dictionary with the uuid as key, create if not exists
-    d = answers.setdefault(qid, {})
+    global _answers_json_cache
+    d = answers[qid]
     d[user] = data['answer']
+    _answers_json_cache = None
+    _answer_json_by_qid.pop(qid, None)
     # notify the subscribers
-    logger.info("nicknames:", nicknames)
-    logger.info("answers:", answers)
-    notify_subscribers(sse_manager, {"qid":qid,"answers": list(answers[qid].values())}, f'A-{qid}')  # Notify subscribers with the new name
+    logger.debug("nicknames: %s", nicknames)
+    logger.debug("answers: %s", answers)
+    notify_subscribers(sse_manager, {"qid":qid,"answers": list(d.values())}, f'A-{qid}')  # Notify subscribers with the new name
     return jsonify({'status': 'success', 'message': 'Data received'}), 200
 # get all answers for a question without the uuid
 # curl -X GET http://localhost:5050/answer/inputField1
@@ -202,14 +285,21 @@ def get_answer(qid):
     if qid not in answers:
         return jsonify({'warning': f'No answers found for the given question: {qid}'}), 200
     else:
-        return jsonify({'answers': list(answers[qid].values())}), 200
+        body = _answer_json_by_qid.get(qid)
+        if body is None:
+            body = json.dumps({'answers': list(answers[qid].values())})
+            _answer_json_by_qid[qid] = body
+        return Response(body, mimetype='application/json'), 200
 
 # get just all answers
 # curl -X GET http://localhost:5050/answers
 @app.route('/answers', methods=['GET'])
 def get_answers():
     """Return the list of answers for all questions."""
-    return jsonify({'answers': answers}), 200
+    global _answers_json_cache
+    if _answers_json_cache is None:
+        _answers_json_cache = json.dumps({'answers': answers})
+    return Response(_answers_json_cache, mimetype='application/json'), 200
 
 
 # ----------------------------------------------------------------------------------------------------- Monitoring routes
@@ -219,10 +309,13 @@ def get_answers():
 def home():
     """Give feadback about the running threads."""
     current_thread = threading.current_thread() # Get the current thread
-    message = f"Handling with: {current_thread.name}, Alive: {current_thread.is_alive()}"
-    threads = threading.enumerate()  # List all live threads
-    thread_info = '\n - '.join(f"{thread.name} (Alive: {thread.is_alive()})" for thread in threads)
-    return f'Active threads:\n - {thread_info} \n => {message}'
+    def gen():
+        yield 'Active threads:\n'
+        # enumerated threads are alive by definition, so no is_alive() calls
+        for thread in threading.enumerate():
+            yield f' - {thread.name}\n'
+        yield f' => Handling with: {current_thread.name}\n'
+    return Response(gen(), mimetype='text/plain')
 
 # test with
 # curl -X GET http://localhost:5050/monitor
@@ -242,13 +335,8 @@ def get_listener_count():
     try:
         # Access the SSE manager stored in app extensions
         sse = app.extensions["sse-manager"]
-        
-        # Retrieve the actual listener count by invoking the method
-        listener_count_proxy = sse.get_listener_count()  # Proxy object
-        
-        # Use ._getvalue() on the proxy object to force the value retrieval from the server
-        listener_count = listener_count_proxy._getvalue()  # Convert AutoProxy to value
-        
+        # the bus is in-process, so this is a plain method call, no proxy round-trip
+        listener_count = sse.get_listener_count()
         return jsonify({"listener_count": listener_count}), 200
     except Exception as e:
         logger.error(f"Failed to get listener count: {e}")
@@ -259,7 +347,7 @@ def get_listener_count():
 @app.route('/ipsocket')
 def ipsocket():
     """Get the IP address and port number of the current machine."""
-    return jsonify({"ip": get_ip(), "socketNr": config.app_socketNr})
+    return jsonify({"ip": CACHED_IP, "socketNr": config.app_socketNr})
 
 # ----------------------------------------------------------------------------------------------------- Static routes
 # start in the browser with http://localhost:5050/
@@ -276,11 +364,34 @@ def serve_frontend():
 # test with, by getting the favicon
 # curl -X GET http://localhost:5050/favicon.ico
 # to serve all static files (including subdirectory assets)
+
+# cache of resolved static files: filename -> (absolute path, mtime_ns, etag),
+# so repeated requests skip the path joining/safety checks of send_from_directory
+_static_index = {}
+
 @app.route('/<path:filename>')
 def serve_static(filename):
-    logger.info(f"serve_static: {filename} from {static_folder}")
-    logger.info(f"serve_static: {filename}")
-    response = send_from_directory(static_folder, filename) # type: ignore
+    logger.debug("serve_static: %s from %s", filename, static_folder)
+    entry = _static_index.get(filename)
+    if entry is None:
+        path = safe_join(static_folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+    else:
+        path = entry[0]
+    # one os.stat per request keeps the cached ETag honest when a static file
+    # is replaced on disk while the server is running
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        _static_index.pop(filename, None)
+        abort(404)
+    if entry is None or entry[1] != file_stat.st_mtime_ns:
+        etag = f"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"
+        entry = (path, file_stat.st_mtime_ns, etag)
+        _static_index[filename] = entry
+    # conditional=True lets clients with a matching ETag get an empty 304 reply
+    response = send_file(path, conditional=True, etag=entry[2], last_modified=file_stat.st_mtime)
     response.headers['Cache-Control'] = 'public, max-age=31536000'
     return response
 
@@ -290,4 +401,4 @@ def serve_static(filename):
 def log_request_info():
     # Log method, URL, headers, and body of the request
     client_ip = request.headers.get('X-Forwarded-For', request.remote_addr)
-    logger.info(f"Request [{request.method}] {request.url} from {client_ip}")
+    logger.info("Request [%s] %s from %s", request.method, request.url, client_ip)
@@ -1,4 +1,4 @@
-""" 
+"""
     Configuration file for the backend. Contains all the parameters that can be changed by the user.
 """
 
@@ -6,6 +6,8 @@ import os
 import logging
 import dotenv
 
+from dataclasses import dataclass
+
 # Load environment variables from "../.env" file
 dotenv.load_dotenv()
 # load PRESENTATION_NAME from .env file
@@ -17,14 +19,16 @@ logger.info(f"name for presentation in .env file: '{PRESENTATION_NAME}'")
 
 # config.py
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    def __init__(self):
-        # app
-        self.app_html = PRESENTATION_NAME+".html" if PRESENTATION_NAME else "index.html"
-        self.app_socketNr = 5050
-        # sse demaon
-        self.sse_port = 2437
-        self.sse_ping = False
+    """Immutable server configuration; slots make config.* lookups C-level
+    attribute reads and keep the instance safe to share across threads."""
+    # app
+    app_html: str
+    app_socketNr: int = 5050
+    # sse daemon
+    sse_port: int = 2437
+    sse_ping: bool = False
 
 # Singleton instance of the Config class
-config = Config()
\ No newline at end of file
+config = Config(app_html=PRESENTATION_NAME+".html" if PRESENTATION_NAME else "index.html")
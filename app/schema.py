@@ -1,10 +1,14 @@
+import re
+
+from jsonschema import Draft7Validator
+
 # Define your schema
 likert_schema = {
     "type": "object",
     "properties": {
         "likert": {"type": "string"},
         "user": {"type": "string"},
-        "value": {"type": "string", "pattern": "^[1-5]$"}  # Expecting a value from 1 to 5 in string form
+        "value": {"type": "string", "pattern": "^[0-4]$"}  # Expecting a value from 0 to 4 in string form
     },
     "required": ["likert", "user", "value"]
 }
@@ -27,3 +31,26 @@ answer_schema = {
     },
     "required": ["answer", "qid", "user"]  # All three fields are required
 }
+
+# Pre-compiled validators: building the validator tree once at import time avoids
+# re-checking the schema and rebuilding the validator on every POST request.
+Draft7Validator.check_schema(likert_schema)
+Draft7Validator.check_schema(user_schema)
+Draft7Validator.check_schema(answer_schema)
+likert_validator = Draft7Validator(likert_schema)
+user_validator = Draft7Validator(user_schema)
+answer_validator = Draft7Validator(answer_schema)
+
+# Compiled regex for the uuid pattern, so the hot POST paths can reject bad
+# fields with a direct match instead of a full schema walk.
+uuid_pattern = re.compile(r"^[0-9a-fA-F\-]+$")
+
+
+def is_valid_likert_value(value):
+    """Fast-path check for the likert value pattern "^[0-4]$"."""
+    return isinstance(value, str) and len(value) == 1 and "0" <= value <= "4"
+
+
+def is_valid_uuid(value):
+    """Fast-path check for the uuid pattern of user_schema."""
+    return isinstance(value, str) and uuid_pattern.match(value) is not None
@@ -1,5 +1,6 @@
-from flask import Response
 import json
+import queue
+import threading
 
 from .manager import SSEManager
 from .announcer import format_sse
@@ -9,63 +10,62 @@ logger = logging.getLogger(__name__)
 
 subscribers = set()  # Store all subscribers to the SSE server
 
+# queue feeding the background broadcaster thread, so the POST handlers never
+# wait on the fan-out to the listener queues
+_broadcast_queue = queue.SimpleQueue()
 
-def notify_subscribers(sse_manager, data, event_type=None):
-    # connect to the remote SSE server
-    sse_manager.connect() #type: ignore
-    # build the message in the format of Server-Sent Events (SSE)
-    msg = format_sse(data=json.dumps(data),event = event_type)  
-    # excute the proxy method sse_put() on the remote SSE server
-    # put the message into the queue.Queue, where listen() then get's it from.
-    sse_manager.sse_put(msg) #type: ignore
+
+def _broadcaster():
+    """Daemon loop: serialize and fan out queued events to the SSE bus."""
+    while True:
+        sse_manager, data, event_type, serialized = _broadcast_queue.get()
+        try:
+            payload = data if serialized else json.dumps(data)
+            # build the message in the format of Server-Sent Events (SSE)
+            msg = format_sse(data=payload,event = event_type)
+            # put the message into the queue.Queue, where listen() then get's it from.
+            sse_manager.sse_put(msg)
+        except Exception as e:
+            logger.error("broadcast failed: %s", e)
+
+
+def notify_subscribers(sse_manager, data, event_type=None, serialized=False):
+    """Publish data to all SSE subscribers without blocking the caller.
+
+    The event is handed to a background thread which serializes the payload
+    exactly once on the producer side and fans the ready-made message out to
+    every listener queue, so the HTTP response returns as soon as state is
+    updated. Callers that already hold a JSON string (e.g. a cached payload)
+    pass serialized=True to skip the json.dumps as well.
+    """
+    _broadcast_queue.put((sse_manager, data, event_type, serialized))
 
 def stream(sse_manager):
     """Stream Server-Sent Events (SSE) to the client."""
-    # connect to the remote SSE server
-    sse_manager.connect()
-    # execute the proxy method sse_listen() on the remote SSE server
     # returns a queue.Queue that blocks until a new item is added to the SSE stream
-    messages = sse_manager.sse_listen()  # returns a queue.Queue # type: ignore
+    messages = sse_manager.sse_listen()
     try:
         while True:
             msg = messages.get()  # blocks until a new message is put into the queue by ping
             if msg is None:
-                logger.error(f"stream received None message: {msg}")
-                break
-            msgDict = parse_sse_msg(msg)
-            if msgDict is None:
-                logger.error(f"stream received invalid SSE message: {msg}")
+                logger.error("stream received None message")
                 break
-
-            # yield msg # yield the message to the client's HTTP connection in progress
-            if 'data' in msgDict:
-                # yield f"data: {msgDict['data']}\n\n"
-                yield msg
-            elif 'data' in msgDict and 'event' in msgDict:
-                yield f"event: {msgDict['event']}\ndata: {msgDict['data']}\n\n"
-            else:
-                logger.error(f"stream received SSE nonconfrom message: {msgDict}")
-                yield f"error: message\n{msg}\n\n"
+            # the frame was fully formatted at publish time (format_sse), so
+            # every listener just forwards the ready-made string as-is
+            yield msg
     except Exception as e:
+        # the response is already streaming, so all we can do is log and stop
         logger.error(f"Error during SSE communication: {e}")
-        return Response("Error", status=500)
-    
-def parse_sse_msg(msg):
-    try:
-        lines = msg.strip('\n').split('\n') 
-        keyVals = [li.split(":") for li in lines]
-        keyVals = [(kv[0],kv[1]) for kv in keyVals]
-        return dict(keyVals)
-    except (IndexError, ValueError) as e:
-        logger.error(f"Invalid SSE message: {e}")
-        return None
-    
-def setup_sse_listen(app, sse_port):
-    sse_manager = SSEManager(address=("127.0.0.1", sse_port), authkey=b'sse')
-    logger.info(f"remote sse manager is serving at: {sse_manager.address}")
+
+
+def setup_sse_listen(app):
+    sse_manager = SSEManager()
+    logger.info("in-process sse manager created")
     # Save this so we can use it later in the extension
     if not hasattr(app, "extensions"):  # pragma: no cover
         app.extensions = {}
-    app.extensions["sse-manager"] = sse_manager 
+    app.extensions["sse-manager"] = sse_manager
+    # start the background broadcaster that drains _broadcast_queue
+    threading.Thread(target=_broadcaster, daemon=True, name="sse-broadcaster").start()
     return sse_manager
 
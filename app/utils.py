@@ -2,8 +2,53 @@ import psutil
 import socket
 import logging
 
+from collections import OrderedDict
+
 logger = logging.getLogger(__name__)
 
+
+class LRUDict(OrderedDict):
+    """A dict bounded to maxsize entries.
+
+    Inserting beyond the bound evicts the least recently used entry, so the
+    containers of a long-running server cannot grow without limit. A
+    default_factory (like collections.defaultdict) creates missing values on
+    access, and an optional on_evict(key, value) callback lets callers
+    invalidate caches derived from the evicted entry.
+    """
+
+    def __init__(self, maxsize=10000, default_factory=None, on_evict=None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.default_factory = default_factory
+        self.on_evict = on_evict
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __missing__(self, key):
+        if self.default_factory is None:
+            raise KeyError(key)
+        value = self.default_factory()
+        self[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            old_key, old_value = self.popitem(last=False)
+            logger.debug("LRUDict -- evicting key: %s", old_key)
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
 def get_ip():
     """
         Get the IP address of the current machine    
@@ -1,46 +1,43 @@
 import os
-import logging
 
-# --- imports
-from multiprocessing import Process, Manager, Event
-from waitress import serve
-from flask import g
+# gevent must monkey-patch the stdlib before anything else imports socket or
+# threading, so this block has to stay at the very top of the module
+if os.environ.get("FLASK_ENV") != "development":
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError:
+        monkey = None
+else:
+    monkey = None
+
+import logging
 
 # -- local imports
-from app.app import app
-from app.sse.manager import start_sse
-from app.utils import get_ip
-from app.log_config import setup_logging, debug_logging
+from app.app import app, CACHED_IP
+from app.log_config import setup_logging
 
 # --- run main
 if __name__ == '__main__':
     from app.config import config
     setup_logging()
 
-    # --- multiprocessing -- Shared dictionary for managing data between processes
-    # Store shared_data in Flask global context
-
-    # --- start the SSE server
-    if os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug:
-        logging.info(f"serve in LAN http://{get_ip()}:{config.app_socketNr}")
-        # process event to synchronize server startups, wait for SSE server to be ready
-        if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
-            logging.info("We run under Werkzeug, so we are in the reloaded subprocess")
-        elif not app.debug:
-            logging.info("We run in production mode")
-        sse_ready_event = Event()
-        sse_process = Process(target=start_sse, daemon=True, args=(sse_ready_event,config.sse_port))
-        sse_process.start()
-            # Store PID in the global variable
-        app.config['global_pid'] = sse_process.pid
-        logging.info(f"SSE -- Started SSE server process with PID: {app.config['global_pid']}")
-        sse_ready_event.wait() # wait for the server to be ready
-        logging.info("Starting Flask app")
-    # Start the Flask application in a separate thread
+    # The SSE bus runs in-process (see app/sse/manager.py), so there is no
+    # separate SSE server process to spawn and synchronize with any more.
+    logging.info(f"serve in LAN http://{CACHED_IP}:{config.app_socketNr}")
+    # Start the Flask application
     if os.environ.get("FLASK_ENV") == "development":
-        logging.info(f"Flask app running in development mode on http://{get_ip()}:{config.app_socketNr}")
+        logging.info(f"Flask app running in development mode on http://{CACHED_IP}:{config.app_socketNr}")
         app.run(host='0.0.0.0', port=config.app_socketNr, threaded=True, debug=True)
+    elif monkey is not None:
+        # every /events subscriber holds its connection open for its whole
+        # session; under gevent each subscriber costs a greenlet (KBs) instead
+        # of a pool thread, so the server is no longer capped at `threads`
+        # concurrent SSE clients
+        from gevent.pywsgi import WSGIServer
+        logging.info(f"Serving with gevent on http://{CACHED_IP}:{config.app_socketNr}")
+        WSGIServer(('0.0.0.0', config.app_socketNr), app).serve_forever()
     else:
         from waitress import serve
-        logging.info(f"Serving with Waitress on http://{get_ip()}:{config.app_socketNr}")
-        serve(app, host='0.0.0.0', port=config.app_socketNr, threads=100, connection_limit=100)
\ No newline at end of file
+        logging.info(f"Serving with Waitress on http://{CACHED_IP}:{config.app_socketNr}")
+        serve(app, host='0.0.0.0', port=config.app_socketNr, threads=100, connection_limit=100)
@@ -0,0 +1,33 @@
+import pytest
+
+from app.utils import LRUDict
+
+
+def test_evicts_least_recently_used():
+    lru = LRUDict(maxsize=2)
+    lru['a'] = 1
+    lru['b'] = 2
+    lru['a']  # touch 'a' so 'b' is the oldest entry
+    lru['c'] = 3
+    assert 'b' not in lru
+    assert list(lru) == ['a', 'c']
+
+
+def test_default_factory_creates_missing_values():
+    lru = LRUDict(maxsize=2, default_factory=dict)
+    lru['q1']['user'] = 'yes'
+    assert lru['q1'] == {'user': 'yes'}
+    with pytest.raises(KeyError):
+        LRUDict(maxsize=2)['missing']
+
+
+def test_on_evict_callback_receives_evicted_entry():
+    evicted = []
+    lru = LRUDict(maxsize=1, on_evict=lambda k, v: evicted.append((k, v)))
+    lru['a'] = 1
+    lru['b'] = 2
+    assert evicted == [('a', 1)]
+
+
+if __name__ == '__main__':
+    pytest.main()